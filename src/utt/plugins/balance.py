@@ -14,15 +14,21 @@ from __future__ import annotations
 
 import argparse
 import datetime
-from collections.abc import Iterator
-from itertools import pairwise
+import functools
+from typing import TYPE_CHECKING
 
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
+import numpy as np
 
 from utt.api import _v1
 
+if TYPE_CHECKING:
+    from rich.text import Text
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy fallback is used instead
+    njit = None
+
 # Day names in weekday order (Monday=0 through Sunday=6)
 DAY_NAMES: tuple[str, ...] = (
     "monday",
@@ -34,17 +40,86 @@ DAY_NAMES: tuple[str, ...] = (
     "sunday",
 )
 
+# Weekday name -> index lookup (Monday=0 through Sunday=6)
+WEEKDAY_INDEX: dict[str, int] = {name: index for index, name in enumerate(DAY_NAMES)}
+
 # Rich color styles for output
 STYLE_UNDER_TARGET: str = "green"
 STYLE_AT_TARGET: str = "yellow3"
 STYLE_OVER_TARGET: str = "red"
 
+# Styles indexed by comparison sign + 1 (-1 under, 0 at, +1 over target)
+STYLES_BY_SIGN: tuple[str, str, str] = (STYLE_UNDER_TARGET, STYLE_AT_TARGET, STYLE_OVER_TARGET)
+
 # Default target hours
 DEFAULT_DAILY_HOURS: float = 8.0
 DEFAULT_WEEKLY_HOURS: float = 40.0
 DEFAULT_WEEK_START: str = "sunday"
 
 
+@functools.lru_cache(maxsize=None)
+def _rich():
+    """
+    Import rich lazily, once per process.
+
+    This module is imported (and the command registered) on every utt
+    invocation; deferring the rich import means only the balance command
+    itself pays for it.
+
+    Returns
+    -------
+    tuple
+        The (Console, Table, Text) rich classes.
+    """
+    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+
+    return Console, Table, Text
+
+
+def _sum_worked_us(starts_us: np.ndarray, ends_us: np.ndarray, lo_us: int, hi_us: int) -> int:
+    """
+    Sum the microseconds of work intervals clipped to ``[lo_us, hi_us]``.
+
+    Intervals with no overlap contribute nothing. This is the NumPy
+    fallback; when numba is installed it is replaced at import time by a
+    compiled kernel with identical semantics.
+
+    Parameters
+    ----------
+    starts_us : numpy.ndarray
+        Work-activity start times as int64 microseconds since the epoch.
+    ends_us : numpy.ndarray
+        Work-activity end times as int64 microseconds since the epoch.
+    lo_us : int
+        Range start (inclusive) in microseconds since the epoch.
+    hi_us : int
+        Range end (inclusive) in microseconds since the epoch.
+
+    Returns
+    -------
+    int
+        Total overlapping microseconds.
+    """
+    durations_us = np.minimum(ends_us, hi_us) - np.maximum(starts_us, lo_us)
+    return int(durations_us[durations_us > 0].sum())
+
+
+if njit is not None:  # pragma: no cover - requires the optional numba install
+
+    @njit(cache=True)
+    def _sum_worked_us(starts_us, ends_us, lo_us, hi_us):  # noqa: F811
+        total = 0
+        for i in range(starts_us.shape[0]):
+            start = max(starts_us[i], lo_us)
+            end = min(ends_us[i], hi_us)
+            duration = end - start
+            if duration > 0:
+                total += duration
+        return total
+
+
 class BalanceHandler:
     """
     Handler for the balance command that displays worked time vs targets.
@@ -84,27 +159,35 @@ class BalanceHandler:
         self._now = now
         self._entries = entries
         self._output = output
+        self._daily_target = datetime.timedelta(hours=args.daily_hrs)
+        self._weekly_target = datetime.timedelta(hours=args.weekly_hrs)
+        self._week_start_index = WEEKDAY_INDEX[args.week_start]
+        self._week_start_display = args.week_start[:1].upper() + args.week_start[1:]
+
+        Console, _, _ = _rich()
+        self._console = Console(file=output)
 
     def __call__(self) -> None:
         """Execute the balance command and display results."""
         today = self._now.date()
         week_start = self._get_week_start_date(today)
 
-        worked_today = self._calculate_worked_time(today, today)
-        worked_week = self._calculate_worked_time(week_start, today)
+        # Extract the work-activity arrays once; both worked-time queries
+        # reuse them with different date windows.
+        starts, ends = self._entries_to_activities()
 
-        daily_target = datetime.timedelta(hours=self._args.daily_hrs)
-        weekly_target = datetime.timedelta(hours=self._args.weekly_hrs)
+        worked_today = self._calculate_worked_time(starts, ends, today, today)
+        worked_week = self._calculate_worked_time(starts, ends, week_start, today)
 
-        remaining_today = daily_target - worked_today
-        remaining_week = weekly_target - worked_week
+        remaining_today = self._daily_target - worked_today
+        remaining_week = self._weekly_target - worked_week
 
         self._display_table(
             worked_today=worked_today,
             remaining_today=remaining_today,
             worked_week=worked_week,
             remaining_week=remaining_week,
-            week_start_day=self._args.week_start.capitalize(),
+            week_start_day=self._week_start_display,
         )
 
     def _get_week_start_date(self, today: datetime.date) -> datetime.date:
@@ -132,25 +215,34 @@ class BalanceHandler:
         >>> handler._get_week_start_date(date(2025, 11, 26))
         datetime.date(2025, 11, 23)  # Previous Sunday
         """
-        week_start_index = DAY_NAMES.index(self._args.week_start.lower())
         today_index = today.weekday()
 
-        days_since_week_start = (today_index - week_start_index) % 7
+        days_since_week_start = (today_index - self._week_start_index) % 7
         return today - datetime.timedelta(days=days_since_week_start)
 
     def _calculate_worked_time(
         self,
+        starts: np.ndarray,
+        ends: np.ndarray,
         start_date: datetime.date,
         end_date: datetime.date,
     ) -> datetime.timedelta:
         """
         Calculate total working time for a date range.
 
-        Filters activities to only include WORK type activities (excluding
-        breaks and hello entries) and sums their durations.
+        Binary-searches the sorted interval arrays for the slice that can
+        overlap the range, then clips that slice and sums its overlapping
+        microseconds with the _sum_worked_us kernel. The arrays are
+        computed once per command invocation and shared between the today
+        and week queries.
 
         Parameters
         ----------
+        starts : numpy.ndarray
+            Work-activity start times as int64 microseconds since the
+            epoch.
+        ends : numpy.ndarray
+            Work-activity end times as int64 microseconds since the epoch.
         start_date : datetime.date
             Start of the date range (inclusive).
         end_date : datetime.date
@@ -161,98 +253,81 @@ class BalanceHandler:
         datetime.timedelta
             Total working time excluding breaks and hello entries.
         """
-        activities = self._get_activities_for_range(start_date, end_date)
-        work_activities = [
-            activity
-            for activity in activities
-            if activity.type == _v1.Activity.Type.WORK
-            and activity.name.name != _v1.HELLO_ENTRY_NAME
-        ]
-        return sum((activity.duration for activity in work_activities), datetime.timedelta())
-
-    def _get_activities_for_range(
-        self,
-        start_date: datetime.date,
-        end_date: datetime.date,
-    ) -> list[_v1.Activity]:
+        if starts.size == 0:
+            return datetime.timedelta()
+
+        start_dt = datetime.datetime.combine(start_date, datetime.time.min)
+        end_dt = datetime.datetime.combine(end_date, datetime.time.max)
+        lo_us = int(np.datetime64(start_dt, "us").astype(np.int64))
+        hi_us = int(np.datetime64(end_dt, "us").astype(np.int64))
+
+        # Entries are chronological, so the arrays are sorted: binary-search
+        # the slice of intervals that can overlap the range instead of
+        # clipping every interval in the log.
+        lo_idx = int(np.searchsorted(ends, lo_us, side="right"))
+        hi_idx = int(np.searchsorted(starts, hi_us, side="right"))
+
+        total_us = _sum_worked_us(starts[lo_idx:hi_idx], ends[lo_idx:hi_idx], lo_us, hi_us)
+        return datetime.timedelta(microseconds=int(total_us))
+
+    @staticmethod
+    def _work_mask(entries: list[_v1.Entry]) -> np.ndarray:
         """
-        Get activities within the specified date range.
+        Build a boolean mask of activities that count as worked time.
+
+        An activity counts when its naming entry is WORK type (not a break
+        or ignored entry) and is not the hello marker that starts a day.
+        utt's log convention marks breaks with a ``**`` name suffix and
+        ignored entries with ``***``, so a single ``**`` suffix check
+        excludes both.
 
         Parameters
         ----------
-        start_date : datetime.date
-            Start of the date range (inclusive).
-        end_date : datetime.date
-            End of the date range (inclusive).
+        entries : list[_v1.Entry]
+            The entries that name each activity.
 
         Returns
         -------
-        list[_v1.Activity]
-            Activities that fall within or overlap the date range,
-            clipped to the range boundaries.
+        numpy.ndarray
+            Boolean array, True where the activity counts as worked time.
         """
-        activities = list(self._entries_to_activities())
-        return self._filter_and_clip_activities(activities, start_date, end_date)
+        hello = _v1.HELLO_ENTRY_NAME
+        return np.fromiter(
+            (entry.name != hello and not entry.name.endswith("**") for entry in entries),
+            dtype=bool,
+            count=len(entries),
+        )
 
-    def _entries_to_activities(self) -> Iterator[_v1.Activity]:
+    def _entries_to_activities(self) -> tuple[np.ndarray, np.ndarray]:
         """
-        Convert entries to activities.
+        Extract work-activity start/end times from entries as NumPy arrays.
 
         An activity spans between two consecutive entries, with the second
         entry's name being the activity name and the time difference being
-        the activity duration.
-
-        Yields
-        ------
-        _v1.Activity
-            Activity objects derived from consecutive entry pairs.
-        """
-        for prev_entry, next_entry in pairwise(self._entries):
-            yield _v1.Activity(
-                next_entry.name,
-                prev_entry.datetime,
-                next_entry.datetime,
-                False,
-                next_entry.comment,
-            )
-
-    def _filter_and_clip_activities(
-        self,
-        activities: list[_v1.Activity],
-        start_date: datetime.date,
-        end_date: datetime.date,
-    ) -> list[_v1.Activity]:
-        """
-        Filter activities to date range and clip those spanning boundaries.
-
-        Activities that partially overlap the date range are clipped to only
-        include the portion within the range. Activities fully outside the
-        range are excluded.
-
-        Parameters
-        ----------
-        activities : list[_v1.Activity]
-            All activities to filter.
-        start_date : datetime.date
-            Start of the date range (inclusive).
-        end_date : datetime.date
-            End of the date range (inclusive).
+        the activity duration. The entry datetimes are extracted once into
+        a single array of int64 microseconds since the epoch so that
+        filtering, clipping, and summing run as array (or numba kernel)
+        operations instead of per-activity Python loops. Activities that
+        can never count as worked time (breaks, ignored entries, and the
+        hello marker) are dropped here, before the arrays are built, so no
+        downstream work is spent on them.
 
         Returns
         -------
-        list[_v1.Activity]
-            Activities within the range, with boundary-spanning activities
-            clipped to the range.
+        tuple[numpy.ndarray, numpy.ndarray]
+            Work-activity start times and end times as int64 microseconds
+            since the epoch.
         """
-        start_dt = datetime.datetime.combine(start_date, datetime.time.min)
-        end_dt = datetime.datetime.combine(end_date, datetime.time.max)
+        entries_list = list(self._entries)
+        if len(entries_list) < 2:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
 
-        result = []
-        for activity in activities:
-            clipped = activity.clip(start_dt, end_dt)
-            if clipped.duration > datetime.timedelta():
-                result.append(clipped)
-        return result
+        datetimes_us = np.array(
+            [entry.datetime for entry in entries_list], dtype="datetime64[us]"
+        ).view(np.int64)
+        keep = self._work_mask(entries_list[1:])
+        return datetimes_us[:-1][keep], datetimes_us[1:][keep]
 
     def _display_table(
         self,
@@ -278,27 +353,30 @@ class BalanceHandler:
         week_start_day : str
             Capitalized name of the week start day for display.
         """
-        table = Table()
+        _, Table, _ = _rich()
+
+        table = Table(show_header=True, expand=False)
         table.add_column("")
         table.add_column("Worked", justify="right")
         table.add_column("Remaining", justify="right")
 
-        daily_target = datetime.timedelta(hours=self._args.daily_hrs)
-        weekly_target = datetime.timedelta(hours=self._args.weekly_hrs)
-
-        table.add_row(
-            "Today",
-            self._format_worked(worked_today, daily_target),
-            self._format_remaining(remaining_today),
-        )
-        table.add_row(
-            f"Since {week_start_day}",
-            self._format_worked(worked_week, weekly_target),
-            self._format_remaining(remaining_week),
+        # Build all cells up front, then add the rows in one batch
+        rows = (
+            (
+                "Today",
+                self._format_worked(worked_today, self._daily_target),
+                self._format_remaining(remaining_today),
+            ),
+            (
+                f"Since {week_start_day}",
+                self._format_worked(worked_week, self._weekly_target),
+                self._format_remaining(remaining_week),
+            ),
         )
+        for row in rows:
+            table.add_row(*row)
 
-        console = Console(file=self._output)
-        console.print(table)
+        self._console.print(table)
 
     def _format_worked(
         self,
@@ -323,12 +401,10 @@ class BalanceHandler:
             - Yellow: exactly at target
             - Red: over target
         """
-        text = self._format_timedelta(worked)
-        if worked == target:
-            return Text(text, style=STYLE_AT_TARGET)
-        elif worked > target:
-            return Text(text, style=STYLE_OVER_TARGET)
-        return Text(text, style=STYLE_UNDER_TARGET)
+        _, _, Text = _rich()
+
+        sign = (worked > target) - (worked < target)
+        return Text(self._format_timedelta(worked), style=STYLES_BY_SIGN[sign + 1])
 
     def _format_remaining(self, remaining: datetime.timedelta) -> Text:
         """
@@ -347,13 +423,12 @@ class BalanceHandler:
             - Yellow: exactly zero remaining
             - Red: negative (overtime)
         """
-        is_negative = remaining < datetime.timedelta()
-        text = self._format_timedelta(remaining)
-        if remaining == datetime.timedelta():
-            return Text(text, style=STYLE_AT_TARGET)
-        elif is_negative:
-            return Text(text, style=STYLE_OVER_TARGET)
-        return Text(text, style=STYLE_UNDER_TARGET)
+        _, _, Text = _rich()
+
+        # Negative remaining time means over target
+        zero = datetime.timedelta()
+        sign = (remaining < zero) - (remaining > zero)
+        return Text(self._format_timedelta(remaining), style=STYLES_BY_SIGN[sign + 1])
 
     @staticmethod
     def _format_timedelta(td: datetime.timedelta) -> str:
@@ -377,15 +452,17 @@ class BalanceHandler:
         >>> BalanceHandler._format_timedelta(timedelta(hours=-2, minutes=-15))
         '-2h15'
         """
-        total_seconds = int(td.total_seconds())
-        is_negative = total_seconds < 0
-        total_seconds = abs(total_seconds)
-
-        hours, remainder = divmod(total_seconds, 3600)
+        # td.days is negative and td.seconds positive for negative
+        # timedeltas, so this sum is the signed total seconds without the
+        # float round-trip of total_seconds(). Bump sub-second negatives
+        # up by one to keep truncation toward zero.
+        total_seconds = td.days * 86400 + td.seconds
+        if total_seconds < 0 and td.microseconds:
+            total_seconds += 1
+
+        hours, remainder = divmod(abs(total_seconds), 3600)
         minutes = remainder // 60
-
-        result = f"{hours}h{minutes:02d}"
-        return f"-{result}" if is_negative else result
+        return f"{'-' if total_seconds < 0 else ''}{hours}h{minutes:02d}"
 
 
 def add_args(parser: argparse.ArgumentParser) -> None:
@@ -413,7 +490,7 @@ def add_args(parser: argparse.ArgumentParser) -> None:
     )
     parser.add_argument(
         "--week-start",
-        type=str,
+        type=str.lower,
         default=DEFAULT_WEEK_START,
         choices=DAY_NAMES,
         help=f"Day the work week starts (default: {DEFAULT_WEEK_START})",
@@ -4,10 +4,11 @@ import argparse
 import datetime
 import io
 
+import numpy as np
 import pytest
 
 from utt.api import _v1
-from utt.plugins.balance import BalanceHandler, add_args, balance_command
+from utt.plugins.balance import BalanceHandler, _sum_worked_us, add_args, balance_command
 
 
 @pytest.fixture
@@ -26,6 +27,12 @@ def mock_output():
     return io.StringIO()
 
 
+def calculate_worked_time(handler, start_date, end_date):
+    """Run the fused worked-time calculation with freshly extracted arrays."""
+    starts, ends = handler._entries_to_activities()
+    return handler._calculate_worked_time(starts, ends, start_date, end_date)
+
+
 class TestFormatTimedelta:
     """Tests for the _format_timedelta static method."""
 
@@ -57,6 +64,10 @@ class TestFormatTimedelta:
         td = datetime.timedelta(hours=1, minutes=5)
         assert BalanceHandler._format_timedelta(td) == "1h05"
 
+    def test_sub_second_negative_truncates_toward_zero(self):
+        td = datetime.timedelta(microseconds=-1)
+        assert BalanceHandler._format_timedelta(td) == "0h00"
+
 
 class TestGetWeekStartDate:
     """Tests for week start date calculation."""
@@ -107,7 +118,7 @@ class TestGetWeekStartDate:
 
 
 class TestEntriesToActivities:
-    """Tests for converting entries to activities."""
+    """Tests for extracting work-activity start/end arrays from entries."""
 
     def test_two_entries_one_activity(self, mock_args, mock_output):
         now = datetime.datetime(2025, 11, 26, 17, 0, 0)
@@ -117,13 +128,12 @@ class TestEntriesToActivities:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
+        starts, ends = handler._entries_to_activities()
 
-        assert len(activities) == 1
-        assert activities[0].name.name == "work: task"
-        assert activities[0].duration == datetime.timedelta(hours=8)
+        assert starts.size == 1
+        assert ends[0] - starts[0] == 8 * 60 * 60 * 1_000_000
 
-    def test_three_entries_two_activities(self, mock_args, mock_output):
+    def test_break_activities_are_dropped(self, mock_args, mock_output):
         now = datetime.datetime(2025, 11, 26, 17, 0, 0)
         entries = [
             _v1.Entry(datetime.datetime(2025, 11, 26, 9, 0), "hello", False, None),
@@ -132,13 +142,11 @@ class TestEntriesToActivities:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
+        starts, ends = handler._entries_to_activities()
 
-        assert len(activities) == 2
-        assert activities[0].name.name == "lunch **"
-        assert activities[0].duration == datetime.timedelta(hours=3)
-        assert activities[1].name.name == "work: task"
-        assert activities[1].duration == datetime.timedelta(hours=1)
+        # Only "work: task" survives; "lunch **" never enters the arrays
+        assert starts.size == 1
+        assert ends[0] - starts[0] == 60 * 60 * 1_000_000
 
     def test_single_entry_no_activities(self, mock_args, mock_output):
         now = datetime.datetime(2025, 11, 26, 9, 0, 0)
@@ -147,56 +155,20 @@ class TestEntriesToActivities:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
+        starts, ends = handler._entries_to_activities()
 
-        assert len(activities) == 0
+        assert starts.size == 0
+        assert ends.size == 0
 
     def test_empty_entries(self, mock_args, mock_output):
         now = datetime.datetime(2025, 11, 26, 9, 0, 0)
         entries = []
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
-
-        assert len(activities) == 0
-
-    def test_activity_preserves_entry_comment(self, mock_args, mock_output):
-        """Regression test: Activity must include comment from Entry.
-
-        This test ensures that when entries with comments are converted to
-        activities, the comment is properly passed through. Without this,
-        the Activity constructor raises TypeError for missing 'comment' arg.
-        """
-        now = datetime.datetime(2025, 11, 26, 17, 0, 0)
-        entries = [
-            _v1.Entry(datetime.datetime(2025, 11, 26, 9, 0), "hello", False, None),
-            _v1.Entry(
-                datetime.datetime(2025, 11, 26, 17, 0),
-                "work: task",
-                False,
-                "working on feature X",
-            ),
-        ]
-
-        handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
-
-        assert len(activities) == 1
-        assert activities[0].comment == "working on feature X"
-
-    def test_activity_handles_none_comment(self, mock_args, mock_output):
-        """Regression test: Activity handles None comment gracefully."""
-        now = datetime.datetime(2025, 11, 26, 17, 0, 0)
-        entries = [
-            _v1.Entry(datetime.datetime(2025, 11, 26, 9, 0), "hello", False, None),
-            _v1.Entry(datetime.datetime(2025, 11, 26, 17, 0), "work: task", False, None),
-        ]
-
-        handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
+        starts, ends = handler._entries_to_activities()
 
-        assert len(activities) == 1
-        assert activities[0].comment is None
+        assert starts.size == 0
+        assert ends.size == 0
 
 
 class TestCalculateWorkedTime:
@@ -211,8 +183,8 @@ class TestCalculateWorkedTime:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        worked = handler._calculate_worked_time(
-            datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
         # Only "work: task" (1h) should be counted, not "lunch **" (3h break)
@@ -227,8 +199,8 @@ class TestCalculateWorkedTime:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        worked = handler._calculate_worked_time(
-            datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
         # Overnight "hello" activity should be excluded
@@ -242,8 +214,8 @@ class TestCalculateWorkedTime:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        worked = handler._calculate_worked_time(
-            datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
         assert worked == datetime.timedelta(hours=8)
@@ -253,16 +225,12 @@ class TestCalculateWorkedTime:
         entries = []
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        worked = handler._calculate_worked_time(
-            datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
         assert worked == datetime.timedelta()
 
-
-class TestFilterAndClipActivities:
-    """Tests for activity filtering and clipping."""
-
     def test_clips_activity_spanning_date_boundary(self, mock_args, mock_output):
         now = datetime.datetime(2025, 11, 26, 17, 0, 0)
         entries = [
@@ -271,15 +239,13 @@ class TestFilterAndClipActivities:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
-        filtered = handler._filter_and_clip_activities(
-            activities, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
         # Activity spans from Nov 25 22:00 to Nov 26 02:00
         # Only 2 hours fall on Nov 26 (midnight to 02:00)
-        assert len(filtered) == 1
-        assert filtered[0].duration == datetime.timedelta(hours=2)
+        assert worked == datetime.timedelta(hours=2)
 
     def test_excludes_activities_fully_outside_range(self, mock_args, mock_output):
         now = datetime.datetime(2025, 11, 26, 17, 0, 0)
@@ -290,33 +256,82 @@ class TestFilterAndClipActivities:
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
-        filtered = handler._filter_and_clip_activities(
-            activities, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
         # Activities entirely before Nov 26 should be excluded
-        assert len(filtered) == 0
+        assert worked == datetime.timedelta()
 
-    def test_clips_overnight_activity_into_range(self, mock_args, mock_output):
-        now = datetime.datetime(2025, 11, 26, 17, 0, 0)
+    def test_excludes_activities_after_range(self, mock_args, mock_output):
+        now = datetime.datetime(2025, 11, 27, 17, 0, 0)
         entries = [
-            _v1.Entry(datetime.datetime(2025, 11, 25, 17, 0), "work: old", False, None),
             _v1.Entry(datetime.datetime(2025, 11, 26, 9, 0), "hello", False, None),
-            _v1.Entry(datetime.datetime(2025, 11, 26, 17, 0), "work: today", False, None),
+            _v1.Entry(datetime.datetime(2025, 11, 26, 12, 0), "work: task", False, None),
+            _v1.Entry(datetime.datetime(2025, 11, 27, 9, 0), "hello", False, None),
+            _v1.Entry(datetime.datetime(2025, 11, 27, 17, 0), "work: next day", False, None),
         ]
 
         handler = BalanceHandler(mock_args, now, entries, mock_output)
-        activities = list(handler._entries_to_activities())
-        filtered = handler._filter_and_clip_activities(
-            activities, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
+        worked = calculate_worked_time(
+            handler, datetime.date(2025, 11, 26), datetime.date(2025, 11, 26)
         )
 
-        # Overnight "hello" gets clipped to Nov 26 portion, plus "work: today"
-        assert len(filtered) == 2
-        assert filtered[0].name.name == "hello"
-        assert filtered[0].duration == datetime.timedelta(hours=9)  # midnight to 9am
-        assert filtered[1].name.name == "work: today"
+        # Only Nov 26 work counts; Nov 27 activities are after the range
+        assert worked == datetime.timedelta(hours=3)
+
+
+class TestSumWorkedUs:
+    """Tests for the clipped-interval summation kernel."""
+
+    def test_sums_overlap_only(self):
+        starts_us = np.array([0, 10_000_000], dtype=np.int64)
+        ends_us = np.array([5_000_000, 20_000_000], dtype=np.int64)
+
+        total_us = _sum_worked_us(starts_us, ends_us, 2_000_000, 12_000_000)
+
+        # First interval contributes 3s, second contributes 2s
+        assert total_us == 5_000_000
+
+    def test_non_overlapping_interval_contributes_nothing(self):
+        starts_us = np.array([0], dtype=np.int64)
+        ends_us = np.array([1_000_000], dtype=np.int64)
+
+        assert _sum_worked_us(starts_us, ends_us, 2_000_000, 3_000_000) == 0
+
+    def test_empty_arrays(self):
+        empty = np.empty(0, dtype=np.int64)
+
+        assert _sum_worked_us(empty, empty, 0, 1_000_000) == 0
+
+
+class TestWorkMask:
+    """Tests for the worked-time activity mask."""
+
+    def test_work_entries_are_included(self, mock_args, mock_output):
+        now = datetime.datetime(2025, 11, 26, 17, 0, 0)
+        entries = [
+            _v1.Entry(datetime.datetime(2025, 11, 26, 12, 0), "work: task", False, None),
+        ]
+
+        handler = BalanceHandler(mock_args, now, entries, mock_output)
+        mask = handler._work_mask(entries)
+
+        assert mask.tolist() == [True]
+
+    def test_breaks_and_hello_are_excluded(self, mock_args, mock_output):
+        now = datetime.datetime(2025, 11, 26, 17, 0, 0)
+        entries = [
+            _v1.Entry(datetime.datetime(2025, 11, 26, 9, 0), "hello", False, None),
+            _v1.Entry(datetime.datetime(2025, 11, 26, 12, 0), "lunch **", False, None),
+            _v1.Entry(datetime.datetime(2025, 11, 26, 13, 0), "errand ***", False, None),
+            _v1.Entry(datetime.datetime(2025, 11, 26, 17, 0), "work: task", False, None),
+        ]
+
+        handler = BalanceHandler(mock_args, now, entries, mock_output)
+        mask = handler._work_mask(entries)
+
+        assert mask.tolist() == [False, False, False, True]
 
 
 class TestFormatWorked:
@@ -539,6 +554,13 @@ class TestAddArgs:
         args = parser.parse_args(["--week-start", "monday"])
         assert args.week_start == "monday"
 
+    def test_week_start_is_case_insensitive(self):
+        parser = argparse.ArgumentParser()
+        add_args(parser)
+
+        args = parser.parse_args(["--week-start", "MONDAY"])
+        assert args.week_start == "monday"
+
     def test_week_start_invalid_value_raises(self):
         parser = argparse.ArgumentParser()
         add_args(parser)